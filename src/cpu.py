@@ -1,9 +1,20 @@
-from collections import deque
+import time
 
 import numpy as np
 
 from src.display.abstract_display import AbstractDisplay
 
+try:
+    from src.cpu_core import run_cycle
+except ImportError:  # numba not installed, use the interpreted core only
+    run_cycle = None
+
+# target number of instructions executed per second
+CLOCK_SPEED = 700
+
+# rate at which the timers are decremented and the display is rendered
+FRAME_RATE = 60
+
 class Chip8:
     """Class that implements a CHIP-8 emulator.
     """
@@ -19,11 +30,16 @@ class Chip8:
         # 4KB (4096 bytes) of memory
         self._memory = np.zeros(4096, dtype=np.uint8)
 
+        # cache of decoded instructions, indexed by their memory location
+        self._decode_cache = [None] * self._memory.size
+
         # 1 16-bit index register to point at memory locations
-        self._index = np.uint16(0)
+        self._index = 0
 
-        # 1 stack for 16-bit addresses to call/return subroutines
-        self._stack = deque()
+        # 1 stack for up to 16 16-bit addresses to call/return subroutines,
+        # with a stack pointer to the next free level
+        self._stack = np.zeros(16, dtype=np.uint16)
+        self._stack_pointer = 0
 
         # 16 8-bit general purpose variable registers
         self._variables = np.zeros(16, dtype=np.uint8)
@@ -32,14 +48,17 @@ class Chip8:
         self._program_counter = 0x200  # point to first program address
 
         # 1 8-bit delay timer decremented at a rate of 60 Hz until it reaches 0
-        self._delay_timer = np.uint8(0)
+        self._delay_timer = 0
 
         # 1 8-bit sound timer which functions like the delay timer
-        self._sound_timer = np.uint8(0)
+        self._sound_timer = 0
 
         # establish the rendering object
         self._display = display
 
+        # set when the display has changed since it was last rendered
+        self._display_dirty = False
+
 
         # load the font data into memory
         font_data = np.array(
@@ -65,6 +84,26 @@ class Chip8:
         )
         self._load_into_memory(font_data)
 
+        # table of instruction handlers indexed by the first nibble
+        self._dispatch = [
+            self._op_0,
+            self._op_1,
+            self._op_2,
+            self._op_unknown,  # TODO: 3 through 5
+            self._op_unknown,
+            self._op_unknown,
+            self._op_6,
+            self._op_7,
+            self._op_unknown,  # TODO: 8 through 9
+            self._op_unknown,
+            self._op_A,
+            self._op_unknown,  # TODO: B through C
+            self._op_unknown,
+            self._op_D,
+            self._op_unknown,  # TODO: E through F
+            self._op_unknown
+        ]
+
     def _load_into_memory(
             self,
             payload: np.ndarray,
@@ -79,25 +118,48 @@ class Chip8:
         memory_offset : int, optional
             specifies the memory location to start loading into, by default 0
         """
-        for i, p in enumerate(payload):
-            self._memory[memory_offset + i] = p
+        assert memory_offset + payload.size <= self._memory.size, \
+            "Payload does not fit into memory"
 
-    def _fetch(self) -> None:
+        self._memory[memory_offset:memory_offset + payload.size] = payload
+
+        # memory has changed, so previously decoded instructions may be stale
+        self._decode_cache = [None] * self._memory.size
+
+    def _fetch(self) -> int:
         """Reads the instruction that the program counter is currently pointing
         to in memory.
         Instructions are 2 bytes long, so 2 successive reads are performed,
         combining each 2-byte element into a single 16-bit instruction.
         The program counter is incremented by 2.
         """
-        instruction = self._memory[self._program_counter].astype(np.uint16)
-        instruction <<= 0x8
-        self._program_counter += 1
-        instruction |= self._memory[self._program_counter].astype(np.uint16)
-        self._program_counter += 1
+        high_byte = int(self._memory[self._program_counter])
+        low_byte = int(self._memory[self._program_counter + 1])
+        self._program_counter += 2
 
-        return instruction.astype(np.uint16)
+        return (high_byte << 8) | low_byte
 
-    def _decode_and_execute(self, instruction: np.uint16):
+    def _fetch_decoded(self) -> tuple:
+        """Fetches and decodes the instruction that the program counter is
+        currently pointing to in memory, reusing the cached decode of the
+        instruction if the same memory location has been decoded before.
+        The program counter is incremented by 2.
+
+        Returns
+        -------
+        tuple
+            the handler for the instruction and the arguments to call it with
+        """
+        decoded = self._decode_cache[self._program_counter]
+        if decoded is None:
+            decoded = self._decode(self._fetch())
+            self._decode_cache[self._program_counter - 2] = decoded
+        else:
+            self._program_counter += 2
+
+        return decoded
+
+    def _decode(self, instruction: int) -> tuple:
         """
         Decodes the 36 different CHIP-8 instructions according to section 3 of
         the CHIP-8 Technical Reference:
@@ -114,43 +176,211 @@ class Chip8:
         y = a 4-bit value, the upper 4 bits of the low byte of the instruction
         kk or byte = an 8-bit value, the lowest 8 bits of the instruction
 
-        After instructions are decoded they are executed accordingly.
+        Instructions are decoded to the handler in the dispatch table indexed
+        by the first nibble of the instruction. Every handler takes the
+        instruction followed by these decoded variables.
 
         Parameters
         ----------
-        instruction : np.uint16
-            The 2-byte instruction to be decoded and subsequently executed
-        """
-        # first nibble specifies instruction type
-        first_nibble = instruction & 0xF000
-
-        # x and y used in many instructions so calculate here
-        x = ((instruction & 0x0F00) >> 8).astype(np.uint8)
-        y = ((instruction & 0x00F0) >> 4).astype(np.uint8)
-
-        if first_nibble == 0x0000:
-            if instruction == 0x00E0:
-                self._display.clear()
-            # TODO: more
-        elif first_nibble == 0x1000:
-            self._program_counter = instruction & 0x0FFF
-        # TODO: 2 through 5
-        elif first_nibble == 0x6000:
-            self._variables[x] = instruction & 0x00FF
-        elif first_nibble == 0x7000:
-            self._variables[x] += instruction & 0x00FF
-        # TODO: 8 through 9
-        elif first_nibble == 0xA000:
-            self._index = instruction & 0x0FFF
-        # TODO: B through C
-        elif first_nibble == 0xD000:
-            num_bytes = (instruction & 0x000F).astype(np.uint8)
-            self._display_draw(x, y, num_bytes)
-        # TODO: E through F
-        else:
-            raise RuntimeError(f"Unknown instruction: {instruction}")
-        
-    def _display_draw(self, x: np.uint8, y: np.uint8, num_bytes: np.uint8):
+        instruction : int
+            The 2-byte instruction to be decoded
+
+        Returns
+        -------
+        tuple
+            the handler for the instruction and the arguments to call it with
+        """
+        # decode all variables once, whether or not the instruction uses them
+        op = instruction >> 12  # first nibble specifies instruction type
+        x = (instruction >> 8) & 0xF
+        y = (instruction >> 4) & 0xF
+        n = instruction & 0xF
+        kk = instruction & 0xFF
+        nnn = instruction & 0xFFF
+
+        return self._dispatch[op], (instruction, x, y, n, kk, nnn)
+
+    def _op_0(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """00E0 - CLS: clear the display.
+        00EE - RET: return from a subroutine.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+        """
+        if instruction == 0x00E0:
+            self._display.clear()
+            self._display_dirty = True
+        elif instruction == 0x00EE:
+            if self._stack_pointer == 0:
+                raise RuntimeError("Return with an empty stack")
+            self._stack_pointer -= 1
+            self._program_counter = int(self._stack[self._stack_pointer])
+        # TODO: more
+
+    def _op_1(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """1nnn - JP addr: jump to location nnn.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+        """
+        self._program_counter = nnn
+
+    def _op_2(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """2nnn - CALL addr: call subroutine at nnn.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+        """
+        if self._stack_pointer == self._stack.size:
+            raise RuntimeError("Call with a full stack")
+        self._stack[self._stack_pointer] = self._program_counter
+        self._stack_pointer += 1
+        self._program_counter = nnn
+
+    def _op_6(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """6xkk - LD Vx, byte: set Vx = kk.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+        """
+        self._variables[x] = kk
+
+    def _op_7(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """7xkk - ADD Vx, byte: set Vx = Vx + kk.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+        """
+        # add as ints and wrap explicitly rather than through a numpy ufunc
+        self._variables[x] = (int(self._variables[x]) + kk) & 0xFF
+
+    def _op_A(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """Annn - LD I, addr: set I = nnn.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+        """
+        self._index = nnn
+
+    def _op_D(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """Dxyn - DRW Vx, Vy, nibble: display n-byte sprite starting at memory
+        location I at (Vx, Vy), set VF = collision.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+        """
+        self._display_draw(x, y, n)
+
+    def _op_unknown(
+            self,
+            instruction: int,
+            x: int,
+            y: int,
+            n: int,
+            kk: int,
+            nnn: int
+        ) -> None:
+        """Handler for instructions that are not (yet) supported.
+
+        Parameters
+        ----------
+        instruction : int
+            the 2-byte instruction to be executed
+        x, y, n, kk, nnn : int
+            the variables decoded from the instruction, see _decode
+
+        Raises
+        ------
+        RuntimeError
+            always, as the instruction cannot be executed
+        """
+        raise RuntimeError(f"Unknown instruction: {instruction}")
+
+    def _display_draw(self, x: int, y: int, num_bytes: int):
         """Display n-byte sprite starting at memory location I at (Vx, Vy),
         set VF = collision.
 
@@ -164,31 +394,93 @@ class Chip8:
 
         Parameters
         ----------
-        x : np.uint8
+        x : int
             4-bit variable used to locate x-position stored in
             self._variables[x]
-        y : np.uint8
+        y : int
             4-bit variable used to locate y-position stored in
             self._variables[y]
-        num_bytes : np.uint8
+        num_bytes : int
             the number of bytes to read from memory, starting at the address
             stored at memory location I (self._index)
         """
-        for r in range(num_bytes):
-
-            # grab 1 byte (8-bit) sprite from memory location
-            sprite =  self._memory[self._index + r]
-
-            for c in range(0x0008):  # iterate over each bit in sprite
-                if sprite & 0x0080:  # if current bit not zero
-                    pixel_erased = self._display.set_pixel(
-                        (self._variables[x] + c).astype(np.uint16),
-                        (self._variables[y] + r).astype(np.uint16)
-                    )
-                    self._variables[0x000F] = pixel_erased  # VF = collision
-                sprite <<= 1
+        # wrap the starting position onto the 64 x 32 display
+        vx = int(self._variables[x]) & 63
+        vy = int(self._variables[y]) & 31
+
+        if self._index + num_bytes > self._memory.size:
+            raise RuntimeError("Sprite runs past the end of memory")
+
+        # grab the n-byte (8-bit per row) sprite from memory location I
+        framebuffer = self._display.framebuffer
+        sprite = self._memory[self._index:self._index + num_bytes]
+        sprite = sprite.astype(np.uint64)
+
+        if vx <= 56 and vy + num_bytes <= 32:
+            # fast path: the sprite is fully on-screen, so every row is a plain
+            # shift of its byte and the rows are contiguous
+            rows = framebuffer[vy:vy + num_bytes]
+            sprite <<= np.uint64(56 - vx)
+
+            collision = bool((rows & sprite).any())
+            rows ^= sprite
+        else:
+            # rotate each byte right from the left-most byte of its row so
+            # that pixels past the right edge wrap around to the left, and
+            # wrap rows past the bottom edge around to the top
+            rows = (vy + np.arange(num_bytes)) & 31
+            sprite <<= np.uint64(56)
+            if vx:
+                sprite = (
+                    (sprite >> np.uint64(vx)) | (sprite << np.uint64(64 - vx))
+                )
+
+            old_rows = framebuffer[rows]
+            collision = bool((old_rows & sprite).any())
+            framebuffer[rows] = old_rows ^ sprite
+
+        self._variables[0x000F] = collision  # VF = collision
+
+        self._display_dirty = True
+
+    def _execute(self, num_cycles: int) -> None:
+        """Runs the fetch/decode/execute cycle for a number of instructions.
+        Instructions are handed to the compiled core where available, falling
+        back to the interpreted core for any instruction it does not
+        implement.
 
-        self._display.render()
+        Parameters
+        ----------
+        num_cycles : int
+            the number of instructions to execute
+        """
+        while num_cycles > 0:
+            if run_cycle is not None:
+                (
+                    self._program_counter,
+                    self._index,
+                    self._stack_pointer,
+                    executed,
+                    drawn
+                ) = run_cycle(
+                    self._memory,
+                    self._variables,
+                    self._stack,
+                    self._stack_pointer,
+                    self._index,
+                    self._program_counter,
+                    self._display.framebuffer,
+                    num_cycles
+                )
+                num_cycles -= executed
+                self._display_dirty |= drawn
+
+                if num_cycles == 0:
+                    break
+
+            handler, arguments = self._fetch_decoded()
+            handler(*arguments)
+            num_cycles -= 1
 
     def run(self, program: np.ndarray):
         """Loads in a chip-8 program and runs it.
@@ -201,6 +493,34 @@ class Chip8:
         # load into the standard memory location (0x200)
         self._load_into_memory(program, memory_offset=0x200)
 
+        frame_ns = 1_000_000_000 // FRAME_RATE
+        next_frame_ns = time.perf_counter_ns() + frame_ns
+
+        # instructions owed, in units of 1 / FRAME_RATE, so that the remainder
+        # of CLOCK_SPEED / FRAME_RATE is carried across frames
+        cycles_owed = 0
+
         while True:  # initiate fetch/decode/execute cycle
-            instruction = self._fetch()
-            self._decode_and_execute(instruction)
+            cycles_owed += CLOCK_SPEED
+            self._execute(cycles_owed // FRAME_RATE)
+            cycles_owed %= FRAME_RATE
+
+            # decrement the timers once per frame
+            if self._delay_timer > 0:
+                self._delay_timer -= 1
+            if self._sound_timer > 0:
+                self._sound_timer -= 1
+
+            # only render once per frame, and only if anything has changed
+            if self._display_dirty:
+                self._display.render()
+                self._display_dirty = False
+
+            # sleep off the rest of the frame to hold the target clock speed,
+            # without trying to catch up if the frame overran
+            remaining_ns = next_frame_ns - time.perf_counter_ns()
+            if remaining_ns > 0:
+                time.sleep(remaining_ns / 1_000_000_000)
+                next_frame_ns += frame_ns
+            else:
+                next_frame_ns = time.perf_counter_ns() + frame_ns
@@ -0,0 +1,140 @@
+from numba import njit
+import numpy as np
+
+
+# argument types of run_cycle, given up front so that it is compiled once when
+# this module is imported rather than on its first call mid-emulation
+RUN_CYCLE_SIGNATURE = (
+    "(uint8[::1], uint8[::1], uint16[::1], int64, int64, int64, uint64[::1], "
+    "int64)"
+)
+
+
+@njit(RUN_CYCLE_SIGNATURE, cache=True)
+def run_cycle(
+    memory, variables, stack, stack_pointer, index, pc, framebuffer, num_cycles
+):
+    """Runs the CHIP-8 fetch/decode/execute cycle as compiled machine code.
+
+    Operates directly on the raw np.ndarray state of the CPU and display so
+    that no Python dispatch takes place between instructions. Control is
+    handed back to the caller after num_cycles instructions, or as soon as an
+    instruction is met that the compiled core does not implement, leaving the
+    program counter pointing at that instruction so that it can be executed by
+    the interpreted core.
+
+    Parameters
+    ----------
+    memory : np.ndarray
+        the 4096-byte CHIP-8 memory of type np.uint8
+    variables : np.ndarray
+        the 16 8-bit variable registers of type np.uint8
+    stack : np.ndarray
+        the 16-level stack of addresses of type np.uint16
+    stack_pointer : int
+        the index of the next free level of the stack
+    index : int
+        the 16-bit index register
+    pc : int
+        the program counter, pointing at the next instruction in memory
+    framebuffer : np.ndarray
+        the 32 bit-packed display rows of type np.uint64
+    num_cycles : int
+        the maximum number of instructions to execute
+
+    Returns
+    -------
+    tuple
+        the updated program counter, index register and stack pointer, the
+        number of instructions executed, and a flag that is true if the display
+        has been modified
+    """
+    rows = framebuffer.shape[0]
+    executed = 0
+    drawn = False
+
+    while executed < num_cycles:
+        if pc + 1 >= memory.shape[0]:
+            break  # fetch past the end of memory, left to the interpreted core
+
+        # fetch: combine 2 successive bytes into a single 16-bit instruction,
+        # advancing the program counter here so that every handler below runs
+        # straight back into the next fetch
+        instruction = (int(memory[pc]) << 8) | int(memory[pc + 1])
+        pc += 2
+
+        # decode
+        op = instruction >> 12
+        x = (instruction >> 8) & 0xF
+        y = (instruction >> 4) & 0xF
+        n = instruction & 0xF
+        kk = instruction & 0xFF
+        nnn = instruction & 0xFFF
+
+        # execute
+        if op == 0x6:
+            variables[x] = kk
+        elif op == 0x7:
+            variables[x] = (variables[x] + kk) & 0xFF
+        elif op == 0xD:
+            if index + n > memory.shape[0]:
+                # sprite runs past the end of memory, left to the
+                # interpreted core
+                pc -= 2
+                break
+            vx = variables[x] & 63
+            vy = variables[y] % rows
+            collision = 0
+            if vx <= 56 and vy + n <= rows:
+                # fast path: the sprite is fully on-screen, so every row is a
+                # plain shift of its byte
+                shift = np.uint64(56 - vx)
+                for r in range(n):
+                    sprite = np.uint64(memory[index + r]) << shift
+                    if framebuffer[vy + r] & sprite:
+                        collision = 1
+                    framebuffer[vy + r] ^= sprite
+            else:
+                for r in range(n):
+                    # rotate the sprite right from the left-most byte of the
+                    # row so that any overflow past the right edge wraps around
+                    sprite = np.uint64(memory[index + r]) << np.uint64(56)
+                    if vx:
+                        sprite = (
+                            (sprite >> np.uint64(vx))
+                            | (sprite << np.uint64(64 - vx))
+                        )
+                    py = (vy + r) % rows
+                    if framebuffer[py] & sprite:
+                        collision = 1
+                    framebuffer[py] ^= sprite
+            variables[0xF] = collision  # VF = collision
+            drawn = True
+        elif op == 0xA:
+            index = nnn
+        elif op == 0x1:
+            pc = nnn
+        elif op == 0x2:
+            if stack_pointer == stack.shape[0]:
+                pc -= 2  # stack overflow, left to the interpreted core
+                break
+            stack[stack_pointer] = pc
+            stack_pointer += 1
+            pc = nnn
+        elif op == 0x0:
+            if instruction == 0x00E0:
+                framebuffer[:] = 0
+                drawn = True
+            elif instruction == 0x00EE and stack_pointer > 0:
+                stack_pointer -= 1
+                pc = int(stack[stack_pointer])
+            else:
+                pc -= 2  # not implemented in the compiled core
+                break
+        else:
+            pc -= 2  # not implemented in the compiled core
+            break
+
+        executed += 1
+
+    return pc, index, stack_pointer, executed, drawn
@@ -8,7 +8,8 @@ class AbstractDisplay(ABC):
     emulator.
 
     The display for CHIP-8 is 64 x 32 pixels, and each pixel is represented by
-    0 or 1.
+    0 or 1. The display is stored bit-packed, with each row held as a single
+    64-bit word whose most significant bit is the left-most pixel.
     """
 
     def __init__(self) -> None:
@@ -17,10 +18,19 @@ class AbstractDisplay(ABC):
         self._columns = 64
         self._rows = 32
 
+    @property
+    def framebuffer(self) -> np.ndarray:
+        """The np.ndarray holding the current state of the display grid,
+        exposed so that it can be drawn to directly by the CPU. It is a
+        C-contiguous array of 32 np.uint64 rows that is only ever modified in
+        place.
+        """
+        return self._display
+
     @abstractmethod
     def clear(self) -> None:
-        """Clears the display by re-initialising the 32 x 64 np.ndarray to be
-         all 0s.
+        """Clears the display by resetting the 32 np.uint64 rows to be all 0s
+        in place.
         """
         pass
 
@@ -29,22 +39,3 @@ class AbstractDisplay(ABC):
         """Renders the current state of the display to the console.
         """
         pass
-
-    @abstractmethod
-    def set_pixel(self, x: np.uint16, y: np.uint16) -> bool:
-        """Toggles the pixel value at the location x, y on the display grid.
-        Returns true if the pixel ahs been erased (set from 1 to 0).
-
-        Parameters
-        ----------
-        x : np.uint16
-            x-value of the pixel to be toggled
-        y : np.uint16
-            y-value of the pixel to be toggled
-
-        Returns
-        -------
-        bool
-            returns true if the pixel has been erased, else false
-        """
-        pass
\ No newline at end of file
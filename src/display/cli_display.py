@@ -1,11 +1,11 @@
-import os
+import sys
 
 import numpy as np
 
 from src.display.abstract_display import AbstractDisplay
 
-# allows visualising entire np.ndarray
-np.set_printoptions(threshold=np.inf, linewidth=1000)
+# ANSI escape sequence to move the cursor home and clear the terminal
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
 
 class CliDisplay(AbstractDisplay):
     """Class that implements a renderer to display the output of a CHIP-8
@@ -21,39 +21,23 @@ class CliDisplay(AbstractDisplay):
         """
         super().__init__()
 
-        # initialise the display as a 32 x 64 np.ndarray of 0s
-        self._display = np.zeros((self._rows, self._columns), dtype=np.uint8)
+        # initialise the display as 32 bit-packed np.uint64 rows of 0s
+        self._display = np.zeros(self._rows, dtype=np.uint64)
 
     def clear(self) -> None:
-        """Clears the display by re-initialising the 32 x 64 np.ndarray to be
-         all 0s.
+        """Clears the display by resetting the 32 np.uint64 rows to be all 0s
+        in place.
         """
-        self._display = np.zeros((self._rows, self._columns), dtype=np.uint8)
+        self._display[:] = 0
 
     def render(self) -> None:
         """Renders the current state of the display to the console.
         """
-        os.system("clear")
-        print(self._display)
-
-    def set_pixel(self, x: np.uint16, y: np.uint16) -> bool:
-        """Toggles the pixel value at the location x, y on the display grid.
-        Returns true if the pixel ahs been erased (set from 1 to 0).
-
-        Parameters
-        ----------
-        x : np.uint16
-            x-value of the pixel to be toggled
-        y : np.uint16
-            y-value of the pixel to be toggled
-
-        Returns
-        -------
-        bool
-            returns true if the pixel has been erased, else false
-        """
-    
-        # toggle pixel value (0 to 1 or 1 to 0)
-        self._display[y][x] ^= 1
-
-        return not self._display[y][x]  # returns true if pixel erased
\ No newline at end of file
+        # format each row as its 64 pixel values, left-most pixel first
+        grid = "\n".join(
+            " ".join(format(row, "064b")) for row in self._display.tolist()
+        )
+
+        # write the whole frame to the terminal at once
+        sys.stdout.write(CLEAR_SCREEN + grid + "\n")
+        sys.stdout.flush()
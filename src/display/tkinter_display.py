@@ -1,6 +1,7 @@
-from multiprocessing import Process, Queue
-from queue import Empty
+from multiprocessing import Event, Process, synchronize
+from multiprocessing.shared_memory import SharedMemory
 import tkinter as tk
+import weakref
 
 import numpy as np
 
@@ -22,20 +23,51 @@ class TkinterDisplay(AbstractDisplay):
         super().__init__()
 
         self._pixel_size = pixel_size
-        self._display = np.zeros((self._rows, self._columns), dtype=np.uint8)
-        self._display_state_queue: Queue[np.ndarray] = Queue()
+
+        # back the display with shared memory so the GUI process can read it
+        # directly, with an event to signal when it should be redrawn
+        self._shared_display = SharedMemory(
+            create=True, size=self._rows * np.dtype(np.uint64).itemsize
+        )
+        self._display = np.ndarray(
+            self._rows, dtype=np.uint64, buffer=self._shared_display.buf
+        )
+        self._display[:] = 0
+        self._dirty_event = Event()
+
+        # release the shared memory at exit if the display is never closed
+        self._unlink_shared_display = weakref.finalize(
+            self, self._shared_display.unlink
+        )
 
         # spin out separate process to define/update the tkinter canvas
-        self.tkinter_process = Process(target=self._tkinter_root)
+        self.tkinter_process = Process(
+            target=self._tkinter_root,
+            args=(self._shared_display.name, self._dirty_event)
+        )
         self.tkinter_process.start()
 
-    def _tkinter_root(self):
+    def _tkinter_root(
+        self, shared_display_name: str, dirty_event: synchronize.Event
+    ):
         """Function defining the Tkinter process that runs asynchronously.
         Defines the display canvas and continuously checks for updates to the
-        display state by listening on updates from a queue.
+        display state, which is read directly from shared memory whenever the
+        dirty event is set.
+
+        Parameters
+        ----------
+        shared_display_name : str
+            the name of the shared memory block backing the display
+        dirty_event : synchronize.Event
+            the event set when the display should be redrawn
         """
+        shared_display = SharedMemory(name=shared_display_name)
+        display = np.ndarray(
+            self._rows, dtype=np.uint64, buffer=shared_display.buf
+        )
 
-        # define the window canvas
+        # define the window canvas, drawn as a single image
         root = tk.Tk()
         canvas = tk.Canvas(
             root, bg="black",
@@ -44,61 +76,90 @@ class TkinterDisplay(AbstractDisplay):
         )
         canvas.pack()
 
-        # set up loop to continuously check the queue for state updates
-        def check_queue() -> None:
-            """Function to get display updates from the asynchronous queue and
-            render them on the canvas.
+        # draw into an image with one pixel per display pixel, shown on the
+        # canvas scaled up by pixel_size
+        photo = tk.PhotoImage(width=self._columns, height=self._rows)
+        canvas_image = canvas.create_image(0, 0, anchor="nw")
+        scaled_photo = None
+
+        # the rows currently drawn
+        drawn_rows = [None] * self._rows
+
+        # set up loop to continuously check for state updates
+        def check_display() -> None:
+            """Function to render the shared display on the canvas when it has
+            been updated, redrawing only the rows that changed.
             """
+            nonlocal scaled_photo
 
-            try:
-                grid = self._display_state_queue.get_nowait()
-                for i in range(self._rows):
-                    for j in range(self._columns):
-                        x0, y0 = j * self._pixel_size, i * self._pixel_size
-                        x1, y1 = x0 + self._pixel_size, y0 + self._pixel_size
-                        color = "white" if grid[i, j] == 1 else "black"
-                        canvas.create_rectangle(
-                            x0, y0, x1, y1, outline="grey8", fill=color
-                        )
-            except Empty:
-                pass  # no updates
-
-            root.after(1, check_queue)  # set up a recurring loop
-
-        root.after(1, check_queue)
-        root.mainloop()  # start the main Tkinter loop
-        
+            if dirty_event.is_set():
+                dirty_event.clear()
 
-    def clear(self) -> None:
-        """Clears the display by re-initialising the 32 x 64 np.ndarray to be
-         all 0s.
-        """
-        self._display = np.zeros((self._rows, self._columns), dtype=np.uint8)
+                changed = False
+                for i, row in enumerate(display.tolist()):
+                    if row == drawn_rows[i]:
+                        continue  # row unchanged
 
-    def render(self) -> None:
-        """Renders the current state of the display to the console. The state
-        of the np.ndarray display object is asynchronously broadcast to a
-        separate GUI process that handles the rendering.
-        """
-        self._display_state_queue.put(self._display)
+                    photo.put(self._photo_row(row), to=(0, i))
+                    drawn_rows[i] = row
+                    changed = True
+
+                if changed:
+                    # keep a reference so the scaled image is not collected
+                    scaled_photo = photo.zoom(self._pixel_size)
+                    canvas.itemconfig(canvas_image, image=scaled_photo)
+
+            root.after(1, check_display)  # set up a recurring loop
+
+        root.after(1, check_display)
+        root.mainloop()  # start the main Tkinter loop
+
+        # drop the view onto the shared memory so it can be closed
+        del display
+        shared_display.close()
 
-    def set_pixel(self, x: np.uint16, y: np.uint16) -> bool:
-        """Toggles the pixel value at the location x, y on the display grid.
-        Returns true if the pixel ahs been erased (set from 1 to 0).
+    def _photo_row(self, row: int) -> str:
+        """Formats a bit-packed display row as Tkinter image data, with one
+        image pixel per display pixel.
 
         Parameters
         ----------
-        x : np.uint16
-            x-value of the pixel to be toggled
-        y : np.uint16
-            y-value of the pixel to be toggled
+        row : int
+            the 64-bit display row, most significant bit left-most
 
         Returns
         -------
-        bool
-            returns true if the pixel has been erased, else false
+        str
+            the image data for the row, in the format accepted by
+            tk.PhotoImage.put
         """
-        # toggle pixel value (0 to 1 or 1 to 0)
-        self._display[y][x] ^= 1
+        pixels = format(row, "064b")
 
-        return not self._display[y][x]  # returns true if pixel erased
\ No newline at end of file
+        return "{" + " ".join(
+            "#ffffff" if pixel == "1" else "#000000" for pixel in pixels
+        ) + "}"
+
+    def close(self) -> None:
+        """Closes the GUI process and releases the shared memory backing the
+        display. The display can no longer be used once it has been closed.
+        """
+        self.tkinter_process.terminate()
+        self.tkinter_process.join()
+
+        # drop the view onto the shared memory so it can be closed
+        del self._display
+        self._shared_display.close()
+        self._unlink_shared_display()
+
+    def clear(self) -> None:
+        """Clears the display by resetting the 32 np.uint64 rows to be all 0s
+        in place, as they are shared with the GUI process.
+        """
+        self._display[:] = 0
+
+    def render(self) -> None:
+        """Renders the current state of the display to the console. The
+        display is held in shared memory, so the separate GUI process that
+        handles the rendering is only signalled to redraw it.
+        """
+        self._dirty_event.set()
@@ -0,0 +1,120 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import src.cpu
+from src.cpu import Chip8
+from src.display.abstract_display import AbstractDisplay
+
+
+class HeadlessDisplay(AbstractDisplay):
+    """Display that only holds the framebuffer, without rendering it.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._display = np.zeros(self._rows, dtype=np.uint64)
+
+    def clear(self) -> None:
+        self._display[:] = 0
+
+    def render(self) -> None:
+        pass
+
+
+class TestCores(unittest.TestCase):
+    """Checks that the compiled and interpreted cores are interchangeable by
+    running the same programs through each and comparing the CPU state.
+    """
+
+    def _run(self, program: list, compiled: bool, num_cycles: int=1000):
+        """Runs a program through one of the cores and returns the CPU."""
+        chip_8 = Chip8(HeadlessDisplay())
+        chip_8._load_into_memory(
+            np.array(program, dtype=np.uint8), memory_offset=0x200
+        )
+        run_cycle = src.cpu.run_cycle if compiled else None
+        with mock.patch("src.cpu.run_cycle", run_cycle):
+            chip_8._execute(num_cycles)
+        return chip_8
+
+    def _assert_cores_match(self, program: list):
+        if src.cpu.run_cycle is None:
+            self.skipTest("numba is not installed")
+
+        compiled = self._run(program, compiled=True)
+        interpreted = self._run(program, compiled=False)
+
+        np.testing.assert_array_equal(compiled._memory, interpreted._memory)
+        np.testing.assert_array_equal(
+            compiled._variables, interpreted._variables
+        )
+        np.testing.assert_array_equal(compiled._stack, interpreted._stack)
+        np.testing.assert_array_equal(
+            compiled._display.framebuffer, interpreted._display.framebuffer
+        )
+        self.assertEqual(
+            compiled._stack_pointer, interpreted._stack_pointer
+        )
+        self.assertEqual(compiled._index, interpreted._index)
+        self.assertEqual(
+            compiled._program_counter, interpreted._program_counter
+        )
+        return interpreted
+
+    def _assert_cores_raise(self, program: list, error: type=Exception):
+        if src.cpu.run_cycle is None:
+            self.skipTest("numba is not installed")
+
+        errors = []
+        for compiled in (True, False):
+            with self.assertRaises(error) as context:
+                self._run(program, compiled)
+            errors.append(type(context.exception))
+        self.assertEqual(errors[0], errors[1])
+
+    def test_ibm_logo(self):
+        program = np.fromfile("ibm-logo.ch8", dtype=np.uint8).tolist()
+        chip_8 = self._assert_cores_match(program)
+        self.assertTrue(chip_8._display.framebuffer.any())
+
+    def test_call_and_return(self):
+        program = [0x00] * 0x210
+        program[0x000:0x006] = [0x23, 0x00, 0x61, 0x07, 0x12, 0x04]  # 0x200
+        program[0x100:0x104] = [0x24, 0x00, 0x00, 0xEE]  # 0x300
+        program[0x200:0x204] = [0x60, 0x05, 0x00, 0xEE]  # 0x400
+        chip_8 = self._assert_cores_match(program)
+        self.assertEqual(chip_8._variables[:2].tolist(), [5, 7])
+        self.assertEqual(chip_8._stack_pointer, 0)
+
+    def test_draw_with_wrap_and_collision(self):
+        program = [
+            0x60, 0x3C,  # V0 = 60
+            0x61, 0x1E,  # V1 = 30
+            0xA0, 0x00,  # I = font sprite "0"
+            0xD0, 0x15,  # draw, wrapping right and bottom
+            0x60, 0x3E,  # V0 = 62
+            0xD0, 0x15,  # draw again, overlapping
+            0x12, 0x0C   # loop
+        ]
+        chip_8 = self._assert_cores_match(program)
+        self.assertEqual(chip_8._variables[0xF], 1)
+
+    def test_add_overflow(self):
+        program = [0x60, 0xFA, 0x70, 0x0A, 0x12, 0x04]
+        chip_8 = self._assert_cores_match(program)
+        self.assertEqual(chip_8._variables[0], 4)
+
+    def test_sprite_past_end_of_memory(self):
+        self._assert_cores_raise([0xAF, 0xFE, 0xD0, 0x05], RuntimeError)
+
+    def test_fetch_past_end_of_memory(self):
+        self._assert_cores_raise([0x1F, 0xFF])
+
+    def test_stack_overflow(self):
+        self._assert_cores_raise([0x22, 0x00], RuntimeError)
+
+
+if __name__ == "__main__":
+    unittest.main()